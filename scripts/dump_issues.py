@@ -5,7 +5,7 @@ from jira_reporting.jira_api import JiraClient
 
 def main() -> None:
     s = Settings.from_env()
-    with JiraClient(s) as client:
+    with JiraClient.shared(s) as client:
         me = client.get_myself()
         print(f"Auth OK as: {me.get('displayName') or me.get('name')}")
 
@@ -5,7 +5,7 @@ from jira_reporting.jira_api import JiraClient
 def main() -> int:
     env_path = Path(__file__).resolve().parents[1] / ".env"
     s = Settings.from_env(env_path=env_path)
-    client = JiraClient(s)
+    client = JiraClient.shared(s)
     print(f"Auth OK as: {client.get_myself().get('displayName') or 'n/a'}")
     print(f"Base JQL: {s.jql or '<<none>>'}")
 
@@ -14,7 +14,7 @@ DEFAULT_FIELDS: List[str] = [
 def main() -> int:
     s = Settings.from_env()
 
-    client = JiraClient(s)
+    client = JiraClient.shared(s)
     # 1) Auth-Check
     me = client.get_myself()
     who = me.get("displayName") or me.get("name")
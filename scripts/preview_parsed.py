@@ -5,7 +5,7 @@ from textwrap import shorten
 
 from jira_reporting.config import Settings
 from jira_reporting.jira_api import JiraClient
-from jira_reporting.parse import parse_issue, iter_changelog_items
+from jira_reporting.parse import IssueView
 
 # Schlanke Felderliste – passe sie später nach Bedarf an
 FIELDS = [
@@ -38,7 +38,7 @@ def print_table(rows):
 
 def main():
     s = Settings.from_env()
-    client = JiraClient(s)
+    client = JiraClient.shared(s)
     try:
         me = client.get_myself()
         print(f"Auth OK as: {me.get('displayName') or me.get('name')}")
@@ -54,10 +54,10 @@ def main():
             fields=FIELDS,
             expand=["changelog"],   # falls du Changelog sehen willst
         ):
-            row = parse_issue(raw)
+            row = IssueView(raw)  # lazy: nur die Spalten der Tabelle werden dekodiert
             parsed_rows.append(row)
-            # Optional: Changelog zusammenzählen
-            total_changes += sum(1 for _ in iter_changelog_items(raw))
+            # Optional: Changelog zusammenzählen (ohne ChangeItem pro Eintrag)
+            total_changes += row.changelog_item_count
             if len(parsed_rows) >= 25:  # nur erste 25 Zeilen als Preview anzeigen
                 break
 
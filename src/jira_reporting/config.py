@@ -1,20 +1,61 @@
 # src/jira_reporting/config.py
 from __future__ import annotations
+import atexit
+import importlib.util
+import logging
 import os
+import threading
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import httpx
 from dotenv import load_dotenv, find_dotenv
 
 MYSELF_PATH = "/rest/api/2/myself"
 SEARCH_PATH = "/rest/api/2/search"
 
+log = logging.getLogger(__name__)
+
 def _parse_bool(val: Optional[str], default: bool = True) -> bool:
     if val is None:
         return default
     return str(val).strip().lower() in {"1", "true", "yes", "on"}
 
+def _parse_list(val: Optional[str]) -> Tuple[str, ...]:
+    return tuple(p.strip() for p in (val or "").split(",") if p.strip())
+
+def _has_module(name: str) -> bool:
+    return importlib.util.find_spec(name) is not None
+
+def _accept_encoding(compression: bool) -> str:
+    """Accept-Encoding-Header: gzip/deflate immer, br nur wenn ein Brotli-Decoder installiert ist."""
+    if not compression:
+        return "identity"
+    encodings = ["gzip", "deflate"]
+    if _has_module("brotli") or _has_module("brotlicffi"):
+        encodings.append("br")
+    return ", ".join(encodings)
+
+@lru_cache(maxsize=None)
+def _resolve_dotenv(env_path: Optional[str], cwd: str) -> tuple[Optional[Path], tuple[Path, ...]]:
+    """
+    Sucht die .env (explizit, cwd, Repo-Root, find_dotenv) einmal pro (env_path, cwd)
+    und merkt sich das Ergebnis. Der Cache lebt nur im laufenden Prozess: er hilft bei
+    wiederholtem Settings.from_env() (z.B. serve, Skripte), nicht über mehrere CLI-Aufrufe.
+    Liefert (gefundene Datei oder None, geprüfte Pfade).
+    """
+    candidates = []
+    if env_path:
+        candidates.append(Path(env_path))
+    candidates.append(Path(cwd) / ".env")
+    candidates.append(Path(__file__).resolve().parents[2] / ".env")
+    for p in candidates:
+        if p.is_file():
+            return p, tuple(candidates)
+    found = find_dotenv(usecwd=True)
+    return (Path(found) if found else None), tuple(candidates)
+
 @dataclass(frozen=True)
 class Settings:
     base_url: str
@@ -25,36 +66,22 @@ class Settings:
     timeout_s: float = 30.0
     # NEW: optional JQL aus der .env (kann None sein)
     jql: Optional[str] = None
+    # Connection-Pool / Transport-Tuning
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry_s: float = 30.0
+    http2: bool = False              # benötigt das optionale Extra `jira-reporting[http2]` (h2)
+    compression: bool = True         # Accept-Encoding gzip/deflate (+ br falls verfügbar)
+    # Felder, die auf ein Parent-Issue zeigen. Auf Server/DC verknüpft 'parent' nur Sub-Tasks;
+    # für Epics das Epic-Link-Customfield ergänzen, z.B. JIRA_PARENT_FIELDS=parent,customfield_10008
+    parent_fields: Tuple[str, ...] = ("parent",)
 
     @classmethod
     def from_env(cls, env_path: Optional[str | Path] = None) -> "Settings":
-        # robustes Laden der .env
-        tried = []
-        loaded = False
-        if env_path:
-            p = Path(env_path)
-            tried.append(p)
-            if p.is_file():
-                load_dotenv(p, override=False)
-                loaded = True
-        if not loaded:
-            p = Path.cwd() / ".env"
-            tried.append(p)
-            if p.is_file():
-                load_dotenv(p, override=False)
-                loaded = True
-        if not loaded:
-            repo_root = Path(__file__).resolve().parents[2]
-            p = repo_root / ".env"
-            tried.append(p)
-            if p.is_file():
-                load_dotenv(p, override=False)
-                loaded = True
-        if not loaded:
-            p = find_dotenv(usecwd=True)
-            if p:
-                load_dotenv(p, override=False)
-                loaded = True
+        # robustes Laden der .env (Suche ist gecacht, siehe _resolve_dotenv)
+        env_file, tried = _resolve_dotenv(str(env_path) if env_path else None, os.getcwd())
+        if env_file is not None:
+            load_dotenv(env_file, override=False)
 
         base_url = os.getenv("JIRA_BASE_URL") or os.getenv("BASE_URL")
         pat = os.getenv("JIRA_PAT") or os.getenv("PAT")
@@ -63,6 +90,12 @@ class Settings:
         validate_query = _parse_bool(os.getenv("JIRA_VALIDATE_QUERY"), True)
         timeout_s = float(os.getenv("JIRA_TIMEOUT_S") or 30.0)
         jql = os.getenv("JIRA_JQL")  # kann None sein
+        max_connections = int(os.getenv("JIRA_MAX_CONNECTIONS") or 20)
+        max_keepalive_connections = int(os.getenv("JIRA_MAX_KEEPALIVE_CONNECTIONS") or 10)
+        keepalive_expiry_s = float(os.getenv("JIRA_KEEPALIVE_EXPIRY_S") or 30.0)
+        http2 = _parse_bool(os.getenv("JIRA_HTTP2"), False)
+        compression = _parse_bool(os.getenv("JIRA_COMPRESSION"), True)
+        parent_fields = _parse_list(os.getenv("JIRA_PARENT_FIELDS")) or ("parent",)
 
         missing = []
         if not base_url:
@@ -81,12 +114,82 @@ class Settings:
             validate_query=validate_query,
             timeout_s=timeout_s,
             jql=jql,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry_s=keepalive_expiry_s,
+            http2=http2,
+            compression=compression,
+            parent_fields=parent_fields,
+        )
+
+    def transport_key(self) -> tuple:
+        """Nur die Felder, die den HTTP-Client bestimmen (nicht jql/page_size/validate_query)."""
+        return (
+            self.base_url,
+            self.pat,
+            self.ca_bundle,
+            self.timeout_s,
+            self.max_connections,
+            self.max_keepalive_connections,
+            self.keepalive_expiry_s,
+            self.http2,
+            self.compression,
+        )
+
+    def build_limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry_s,
         )
 
     def build_client(self, transport: Optional[httpx.BaseTransport] = None) -> httpx.Client:
-        headers = {"Authorization": f"Bearer {self.pat}"}
+        headers = {
+            "Authorization": f"Bearer {self.pat}",
+            "Accept-Encoding": _accept_encoding(self.compression),
+        }
         timeout = httpx.Timeout(self.timeout_s)
         verify = self.ca_bundle if self.ca_bundle else True
+        http2 = self.http2
+        if http2 and not _has_module("h2"):
+            # kein harter Fehler: ohne h2 einfach bei HTTP/1.1 bleiben
+            log.warning("JIRA_HTTP2 gesetzt, aber 'h2' ist nicht installiert (pip install jira-reporting[http2]); nutze HTTP/1.1")
+            http2 = False
         return httpx.Client(
-            base_url=self.base_url, headers=headers, timeout=timeout, verify=verify, transport=transport
+            base_url=self.base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            transport=transport,
+            limits=self.build_limits(),
+            http2=http2,
         )
+
+
+# Gemeinsame Client-Registry: ein vorgewärmter Pool pro base_url (Schlüssel: Settings.transport_key()),
+# damit Skripte und extract_issues nicht pro Aufruf neue TCP/TLS-Verbindungen aufbauen.
+_SHARED_CLIENTS: Dict[tuple, httpx.Client] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_client(settings: Settings) -> httpx.Client:
+    """Liefert den geteilten httpx.Client für diese Transport-Settings (wird bei Bedarf angelegt)."""
+    with _SHARED_LOCK:
+        key = settings.transport_key()
+        client = _SHARED_CLIENTS.get(key)
+        if client is None or client.is_closed:
+            client = settings.build_client()
+            _SHARED_CLIENTS[key] = client
+        return client
+
+
+def close_shared_clients() -> None:
+    """Schließt alle geteilten Clients (wird zusätzlich per atexit aufgerufen)."""
+    with _SHARED_LOCK:
+        clients = list(_SHARED_CLIENTS.values())
+        _SHARED_CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+atexit.register(close_shared_clients)
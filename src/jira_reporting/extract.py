@@ -3,10 +3,11 @@ from __future__ import annotations
 
 import json
 import logging
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
 
 from .config import Settings
 from .jira_api import JiraClient
+from .planner import search_partitioned
 
 log = logging.getLogger(__name__)
 
@@ -28,6 +29,51 @@ DEFAULT_FIELDS = [
 ]
 
 
+def _parent_keys(issue: Dict, parent_fields: Sequence[str]) -> Iterator[str]:
+    f = issue.get("fields") or {}
+    for name in parent_fields:
+        val = f.get(name)
+        if isinstance(val, dict):
+            val = val.get("key")
+        if isinstance(val, str) and val:
+            yield val
+
+
+def hydrate_parents(
+    client: JiraClient,
+    issues: Iterable[Dict],
+    *,
+    fields: Optional[List[str]] = None,
+    expand: Optional[List[str]] = None,
+    parent_fields: Sequence[str] = ("parent",),
+    workers: int = 4,
+) -> Iterator[Dict]:
+    """
+    Reicht den Issue-Stream durch und lädt danach alle referenzierten, aber nicht
+    enthaltenen Parents (z.B. 'parent' oder ein Epic-Link-Customfield) gebündelt nach.
+    Wiederholt sich, bis auch deren Parents vorhanden sind. Welche Ebenen erreicht werden,
+    hängt von parent_fields ab: 'parent' allein liefert auf Server/DC nur Sub-Task -> Story;
+    mit dem Epic-Link-Customfield zusätzlich Story -> Epic.
+    """
+    seen: set[str] = set()
+    wanted: set[str] = set()
+    for issue in issues:
+        seen.add(issue.get("key"))
+        wanted.update(_parent_keys(issue, parent_fields))
+        yield issue
+
+    missing = wanted - seen
+    while missing:
+        log.info("Hydrating parents", extra={"count": len(missing)})
+        seen |= missing  # nicht auffindbare Keys nicht erneut anfragen
+        nxt: set[str] = set()
+        for parent in client.get_issues_bulk(sorted(missing), fields, expand=expand, workers=workers):
+            seen.add(parent.get("key"))
+            nxt.update(_parent_keys(parent, parent_fields))
+            yield parent
+        missing = nxt - seen
+
+
 def extract_issues(
     *,
     settings: Settings,
@@ -36,12 +82,20 @@ def extract_issues(
     fields: Optional[List[str]] = None,
     include_recent_changelog: bool = False,
     fetch_full_changelog: bool = False,
+    max_window: Optional[int] = None,
+    workers: int = 1,
+    include_parents: bool = False,
+    parent_fields: Optional[Sequence[str]] = None,
 ) -> Iterable[Dict]:
     """
     Führt zunächst /myself aus (Auth sanity check),
     dann streamt Issues gemäß JQL. Optional: vollständiger Changelog pro Issue.
+    Mit max_window wird die JQL in created-Fenster zerlegt (siehe planner.py),
+    workers > 1 lädt diese Fenster parallel.
+    include_parents hängt fehlende Parents gebündelt am Ende an; parent_fields (Standard:
+    settings.parent_fields) bestimmt die Verweis-Felder und wird automatisch mit abgefragt.
     """
-    client = JiraClient(settings)
+    client = JiraClient.shared(settings)  # wiederverwendeter Pool pro base_url
     try:
         me = client.get_myself()
         log.info("Auth ok", extra={"account": me.get("name") or me.get("displayName")})
@@ -53,7 +107,23 @@ def extract_issues(
     expand = ["changelog"] if include_recent_changelog and not fetch_full_changelog else None
     flds = fields or DEFAULT_FIELDS
 
-    for issue in client.search_issues_stream(jql=jql, page_size=page_size, fields=flds, expand=expand):
+    parent_fields = tuple(parent_fields or settings.parent_fields)
+    if include_parents:
+        # ohne die Verweis-Felder in der Antwort gäbe es nichts nachzuladen
+        flds = list(flds) + [f for f in parent_fields if f not in flds]
+
+    if max_window:
+        stream = search_partitioned(
+            client, jql=jql, max_window=max_window, page_size=page_size, fields=flds, expand=expand, workers=workers
+        )
+    else:
+        stream = client.search_issues_stream(jql=jql, page_size=page_size, fields=flds, expand=expand)
+    if include_parents:
+        stream = hydrate_parents(
+            client, stream, fields=flds, expand=expand, parent_fields=parent_fields, workers=max(1, workers)
+        )
+
+    for issue in stream:
         if fetch_full_changelog:
             ch = list(client.iter_issue_changelog(issue["key"], page_size=100))
             issue["changelog"] = {"histories": ch}
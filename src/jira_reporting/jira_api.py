@@ -1,12 +1,17 @@
 from __future__ import annotations
-from typing import Iterable, Optional, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Optional, Sequence
 import httpx
 
-from .config import Settings
+from .config import Settings, shared_client
 
 MYSELF_PATH = "/rest/api/2/myself"
 SEARCH_PATH = "/rest/api/2/search"
 
+# Grenzen für 'key in (...)'-Batches: Anzahl Keys und Länge der JQL
+BULK_CHUNK_SIZE = 100
+BULK_MAX_JQL_CHARS = 6000
+
 
 class JiraClient:
     def __init__(self, settings: Settings, client: Optional[httpx.Client] = None) -> None:
@@ -14,6 +19,11 @@ class JiraClient:
         self._owns_client = client is None
         self.client = client or settings.build_client()
 
+    @classmethod
+    def shared(cls, settings: Settings) -> "JiraClient":
+        """JiraClient über dem geteilten Pool (close() lässt die Verbindungen offen)."""
+        return cls(settings, client=shared_client(settings))
+
     # lifecycle
     def close(self) -> None:
         if self._owns_client:
@@ -64,28 +74,14 @@ class JiraClient:
         total = None
 
         while True:
-            payload = {
-                "jql": jql,
-                "startAt": next_start,
-                "maxResults": page_size,
-            }
-            if fields is not None:
-                payload["fields"] = fields
-            if expand is not None:
-                payload["expand"] = expand
-            if validate_query is not None:
-                payload["validateQuery"] = bool(validate_query)  # <— NEU
-
-            r = self.client.post(SEARCH_PATH, json=payload)
-            # httpx-Fehler klarer machen
-            if r.status_code >= 400:
-                raise httpx.HTTPStatusError(
-                    f"Jira /search returned {r.status_code}. Body: {r.text}",
-                    request=r.request,
-                    response=r,
-                )
-
-            data = r.json()
+            data = self.search_page(
+                jql=jql,
+                start_at=next_start,
+                max_results=page_size,
+                fields=fields,
+                expand=expand,
+                validate_query=validate_query,
+            )
             issues = data.get("issues", []) or []
             for it in issues:
                 yield it
@@ -98,6 +94,44 @@ class JiraClient:
             if total is not None and next_start >= total:
                 break
 
+    def search_page(
+        self,
+        *,
+        jql: str,
+        start_at: int = 0,
+        max_results: int | None = 50,
+        fields: list[str] | None = None,
+        expand: list[str] | None = None,
+        validate_query: bool | None = None,
+    ) -> dict:
+        """Ein einzelner POST /rest/api/2/search – liefert die rohe Antwort (issues, total, ...)."""
+        payload = {
+            "jql": jql,
+            "startAt": start_at,
+            "maxResults": max_results,
+        }
+        if fields is not None:
+            payload["fields"] = fields
+        if expand is not None:
+            payload["expand"] = expand
+        if validate_query is not None:
+            payload["validateQuery"] = bool(validate_query)  # <— NEU
+
+        r = self.client.post(SEARCH_PATH, json=payload)
+        # httpx-Fehler klarer machen
+        if r.status_code >= 400:
+            raise httpx.HTTPStatusError(
+                f"Jira /search returned {r.status_code}. Body: {r.text}",
+                request=r.request,
+                response=r,
+            )
+        return r.json()
+
+    def count_issues(self, jql: str, *, validate_query: bool | None = None) -> int:
+        """Billiger Count-Probe: maxResults=0 liefert nur 'total', keine Issues."""
+        data = self.search_page(jql=jql, max_results=0, fields=[], validate_query=validate_query)
+        return int(data.get("total") or 0)
+
     def _quote_jql_str(self, s: str) -> str:
         # minimal robustes Quoting (Doppelte Anführungszeichen escapen)
         return '"' + s.replace('"', r'\"') + '"'
@@ -139,6 +173,93 @@ class JiraClient:
             ):
                 yield issue
 
+    def _key_chunks(self, keys: Sequence[str], chunk_size: int) -> list[list[str]]:
+        chunks: list[list[str]] = []
+        cur: list[str] = []
+        length = 0
+        for k in keys:
+            quoted = len(k) + 4  # Anführungszeichen + ", "
+            if cur and (len(cur) >= chunk_size or length + quoted > BULK_MAX_JQL_CHARS):
+                chunks.append(cur)
+                cur, length = [], 0
+            cur.append(k)
+            length += quoted
+        if cur:
+            chunks.append(cur)
+        return chunks
+
+    def get_issues_bulk(
+        self,
+        keys: Iterable[str],
+        fields: list[str] | None = None,
+        *,
+        expand: list[str] | None = None,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        workers: int = 4,
+        ordered: bool = True,
+    ) -> Iterator[dict]:
+        """
+        Lädt Issues zu einer Key-Liste über gebündelte 'key in (...)'-Suchen statt eines Requests pro Key.
+        - Keys werden dedupliziert und in Chunks (max. chunk_size Keys / BULK_MAX_JQL_CHARS) aufgeteilt
+        - Chunks laufen parallel (workers Threads über denselben httpx-Pool), höchstens
+          `workers` Chunks gleichzeitig gepuffert; close() verwirft noch ausstehende Chunks
+        - ordered=True: Ausgabe in der Reihenfolge der Eingabe-Keys, sonst in Ankunftsreihenfolge
+        Unbekannte/nicht sichtbare Keys werden übersprungen (validateQuery=false).
+        """
+        uniq = list(dict.fromkeys(k for k in keys if k))
+        if not uniq:
+            return
+        chunks = self._key_chunks(uniq, chunk_size)
+
+        def fetch(chunk: list[str]) -> list[dict]:
+            keys_jql = ", ".join(self._quote_jql_str(k) for k in chunk)
+            return list(self.search_issues_stream(
+                jql=f"key in ({keys_jql})",
+                page_size=len(chunk),
+                fields=fields,
+                expand=expand,
+                validate_query=False,
+            ))
+
+        # höchstens `workers` Chunks gleichzeitig unterwegs; nachgeschoben wird erst, wenn der
+        # Konsument einen Chunk abholt – so bleibt der Puffer auch bei sehr langen Key-Listen klein
+        pool = ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks))))
+        todo = iter(chunks)
+        pending: dict[Future, list[str]] = {}
+
+        def submit_next() -> None:
+            chunk = next(todo, None)
+            if chunk is not None:
+                pending[pool.submit(fetch, chunk)] = chunk
+
+        try:
+            for _ in range(max(1, workers)):
+                submit_next()
+            while pending:
+                if ordered:
+                    fut = next(iter(pending))  # dict = Einfüge-Reihenfolge = Chunk-Reihenfolge
+                else:
+                    fut = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+                chunk = pending.pop(fut)
+                issues = fut.result()
+                submit_next()
+                if not ordered:
+                    yield from issues
+                    continue
+                # innerhalb eines Chunks nach Eingabe-Key sortieren
+                by_key = {it.get("key"): it for it in issues}
+                for k in chunk:
+                    it = by_key.pop(k, None)
+                    if it is not None:
+                        yield it
+                # z.B. verschobene Issues (alter Key -> neuer Key) am Chunk-Ende
+                yield from by_key.values()
+        finally:
+            # bei close() des Generators: noch nicht gestartete Chunks verwerfen
+            for fut in pending:
+                fut.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+
 # Backward-compat: Tests importieren JiraAPI
 class JiraAPI(JiraClient):
     pass
@@ -147,6 +268,7 @@ class JiraAPI(JiraClient):
 __all__ = [
     "JiraClient",
     "JiraAPI",
+    "BULK_CHUNK_SIZE",
     "MYSELF_PATH",
     "SEARCH_PATH",
 ]
@@ -2,23 +2,30 @@
 from __future__ import annotations
 
 import argparse
-import json
 import logging
+import signal
 import sys
-import uuid
+import threading
 
-from .config import Settings
-from .jira_api import JiraClient
-from .extract import extract_issues
+# Startzeit: hier nur stdlib importieren. httpx/dotenv/config/extract werden erst in den
+# Subcommands geladen, damit --help und Argumentfehler nicht die schweren Module laden
+# (Regressionstest: tests/test_cli.py mit -X importtime).
 
 log = logging.getLogger()
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)-7s [%(name)s] %(message)s",
-)
+
+
+def _setup_logging() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-7s [%(name)s] %(message)s",
+    )
 
 
 def cmd_extract(args: argparse.Namespace) -> int:
+    import json
+    from .config import Settings
+    from .extract import extract_issues
+
     settings = Settings.from_env()  # liest .env / env vars, wie zuvor
     issues_iter = extract_issues(
         settings=settings,
@@ -27,6 +34,10 @@ def cmd_extract(args: argparse.Namespace) -> int:
         fields=args.fields.split(",") if args.fields else None,
         include_recent_changelog=args.expand_changelog,
         fetch_full_changelog=args.full_changelog,
+        max_window=args.max_window,
+        workers=args.workers,
+        include_parents=args.include_parents,
+        parent_fields=args.parent_fields.split(",") if args.parent_fields else None,
     )
     count = 0
     for issue in issues_iter:
@@ -37,6 +48,110 @@ def cmd_extract(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_report(args: argparse.Namespace) -> int:
+    import json
+    from .config import Settings
+    from .extract import extract_issues
+    from .parse import IssueView
+    from .report import Aggregator, DEFAULT_QUANTILES, fields_for
+
+    shards = []
+    for path in args.merge or []:
+        with open(path, encoding="utf-8") as fh:
+            shards.append((path, Aggregator.from_state(json.load(fh))))
+
+    if args.group_by:
+        group_by = [g.strip() for g in args.group_by.split(",") if g.strip()]
+    elif shards:
+        group_by = list(shards[0][1].group_by)  # ohne --group-by: Dimensionen des ersten Shards
+    else:
+        group_by = ["project", "type"]
+    try:
+        quantiles = [float(q) for q in args.quantiles.split(",")] if args.quantiles else list(DEFAULT_QUANTILES)
+    except ValueError:
+        log.error("report: --quantiles erwartet Zahlen zwischen 0 und 1, z.B. 0.5,0.9 (bekommen: %s)", args.quantiles)
+        return 2
+    if any(not 0 <= q <= 1 for q in quantiles):
+        log.error("report: --quantiles müssen zwischen 0 und 1 liegen (bekommen: %s)", args.quantiles)
+        return 2
+    try:
+        agg = Aggregator(group_by)
+    except ValueError as e:
+        log.error("report: %s", e)
+        return 2
+
+    for path, shard in shards:
+        if shard.group_by != agg.group_by:
+            log.error(
+                "report: %s wurde mit --group-by %s erstellt, erwartet %s",
+                path, ",".join(shard.group_by), ",".join(agg.group_by),
+            )
+            return 2
+        agg.merge(shard)
+
+    if args.jql:
+        settings = Settings.from_env()
+        issues_iter = extract_issues(
+            settings=settings,
+            jql=args.jql,
+            page_size=args.page_size,
+            fields=fields_for(group_by),
+            max_window=args.max_window,
+            workers=args.workers,
+        )
+        agg.add_all(IssueView(raw) for raw in issues_iter)
+    elif not args.merge:
+        log.error("report: --jql oder --merge angeben")
+        return 2
+
+    if args.state_out:
+        with open(args.state_out, "w", encoding="utf-8") as fh:
+            json.dump(agg.to_state(), fh)
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            agg.write_json(out, quantiles)
+        else:
+            agg.write_csv(out, quantiles)
+    finally:
+        if args.output:
+            out.close()
+    log.info("Report done", extra={"groups": len(agg.groups)})
+    return 0
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    from .config import Settings
+    from .extract import DEFAULT_FIELDS
+    from .jira_api import JiraClient
+    from .serve import JsonlSink, WebhookService
+
+    settings = Settings.from_env()
+    service = WebhookService(
+        JiraClient.shared(settings),
+        JsonlSink(args.out),
+        host=args.host,
+        port=args.port,
+        fields=args.fields.split(",") if args.fields else DEFAULT_FIELDS,
+        token=args.token,
+        flush_interval=args.flush_interval,
+        sweep_jql=args.sweep_jql or settings.jql,
+        sweep_interval=args.sweep_interval,
+        state_path=args.sweep_state or f"{args.out}.sweep.json",
+    )
+    stop = threading.Event()
+    # SIGTERM (systemd/Scheduler) wie Ctrl+C behandeln, damit stop() den letzten Batch noch schreibt
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+    with service:
+        try:
+            stop.wait()
+        except KeyboardInterrupt:
+            pass
+        log.info("Stopping webhook receiver")
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(prog="jira-reporting")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -47,10 +162,40 @@ def main(argv: list[str] | None = None) -> int:
     p_ext.add_argument("--fields", help="Kommagetrennt; Standard, wenn leer")
     p_ext.add_argument("--expand-changelog", action="store_true", help="liefert die letzten ~100 Changelog-Einträge mit")
     p_ext.add_argument("--full-changelog", action="store_true", help="lädt vollständigen Changelog pro Issue (separat, paginiert)")
+    p_ext.add_argument("--max-window", type=int, help="JQL in created-Fenster mit höchstens so vielen Treffern zerlegen")
+    p_ext.add_argument("--workers", type=int, default=1, help="Fenster parallel laden (nur mit --max-window); puffert je Worker höchstens 2 Seiten")
+    p_ext.add_argument("--include-parents", action="store_true", help="fehlende Parent-Issues gebündelt nachladen")
+    p_ext.add_argument("--parent-fields", help="Kommagetrennte Verweis-Felder für --include-parents, z.B. parent,customfield_10008 (Standard: JIRA_PARENT_FIELDS bzw. parent)")
     p_ext.add_argument("--print-json", action="store_true", help="Issues als JSON auf stdout ausgeben")
     p_ext.set_defaults(func=cmd_extract)
 
+    p_rep = sub.add_parser("report", help="Gruppierte Kennzahlen (Anzahl, Alter) als CSV/JSON")
+    p_rep.add_argument("--jql", help="JQL der auszuwertenden Issues")
+    p_rep.add_argument("--group-by", help="Kommagetrennt: project,type,status,status_category,assignee,priority,component,label (Standard: project,type bzw. wie im ersten --merge-Shard)")
+    p_rep.add_argument("--format", choices=["csv", "json"], default="csv")
+    p_rep.add_argument("--output", help="Zieldatei (Standard: stdout)")
+    p_rep.add_argument("--quantiles", help="Kommagetrennt, z.B. 0.5,0.9,0.99")
+    p_rep.add_argument("--state-out", help="Teil-Aggregat als JSON speichern (zum späteren --merge)")
+    p_rep.add_argument("--merge", nargs="+", metavar="STATE", help="Teil-Aggregate (aus --state-out) zusammenführen")
+    p_rep.add_argument("--page-size", type=int, default=100)
+    p_rep.add_argument("--max-window", type=int, help="JQL in created-Fenster mit höchstens so vielen Treffern zerlegen")
+    p_rep.add_argument("--workers", type=int, default=1, help="Fenster parallel laden (nur mit --max-window); puffert je Worker höchstens 2 Seiten")
+    p_rep.set_defaults(func=cmd_report)
+
+    p_srv = sub.add_parser("serve", help="Webhook-Empfänger: Issue-Events sammeln und gebündelt nachladen")
+    p_srv.add_argument("--host", default="127.0.0.1")
+    p_srv.add_argument("--port", type=int, default=8080)
+    p_srv.add_argument("--out", default="out/changes.ndjson", help="NDJSON-Sink für upsert/delete-Einträge")
+    p_srv.add_argument("--fields", help="Kommagetrennt; Standard, wenn leer")
+    p_srv.add_argument("--token", help="erwarteter ?token=... in der Webhook-URL")
+    p_srv.add_argument("--flush-interval", type=float, default=5.0, help="Sekunden, über die Events gesammelt werden")
+    p_srv.add_argument("--sweep-jql", help="JQL für den periodischen Sicherheits-Sweep (Standard: JIRA_JQL)")
+    p_srv.add_argument("--sweep-interval", type=float, default=600.0, help="Sekunden zwischen zwei Sweeps")
+    p_srv.add_argument("--sweep-state", help="Datei für den Zeitpunkt des letzten Sweeps (Standard: <out>.sweep.json)")
+    p_srv.set_defaults(func=cmd_serve)
+
     args = parser.parse_args(argv)
+    _setup_logging()
     return args.func(args)
 
 
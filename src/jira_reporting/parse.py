@@ -1,6 +1,8 @@
 # src/jira_reporting/parse.py
 from __future__ import annotations
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import cached_property
 from typing import Any, Dict, Iterable, List, Optional
 
 
@@ -40,25 +42,126 @@ def _get(d: Dict[str, Any], path: str, default=None):
     return cur
 
 
+# Feld-Extraktion: gemeinsam genutzt von parse_issue (eager) und IssueView (lazy)
+def _project(f: Dict[str, Any]) -> Optional[str]:
+    return _get(f, "project.key") or _get(f, "project.name")
+
+
+def _assignee(f: Dict[str, Any]) -> Optional[str]:
+    return _get(f, "assignee.displayName") or _get(f, "assignee.name")
+
+
+def _labels(f: Dict[str, Any]) -> List[str]:
+    return list(f.get("labels") or [])
+
+
+def _components(f: Dict[str, Any]) -> List[str]:
+    names = [c.get("name") for c in (f.get("components") or []) if isinstance(c, dict)]
+    return [c for c in names if c]
+
+
+class IssueView:
+    """
+    Lazy Sicht auf ein rohes Issue aus der /search-Antwort.
+    Felder werden erst beim Zugriff dekodiert und dann gecacht – wer nur
+    key/status braucht, zahlt nicht für Komponenten, Labels oder Changelog.
+    """
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        self.raw = raw
+
+    @cached_property
+    def fields(self) -> Dict[str, Any]:
+        return self.raw.get("fields", {}) or {}
+
+    @cached_property
+    def id(self) -> str:
+        return str(self.raw.get("id") or "")
+
+    @cached_property
+    def key(self) -> str:
+        return str(self.raw.get("key") or "")
+
+    @cached_property
+    def project(self) -> Optional[str]:
+        return _project(self.fields)
+
+    @cached_property
+    def issuetype(self) -> Optional[str]:
+        return _get(self.fields, "issuetype.name")
+
+    @cached_property
+    def status(self) -> Optional[str]:
+        return _get(self.fields, "status.name")
+
+    @cached_property
+    def status_category(self) -> Optional[str]:
+        return _get(self.fields, "status.statusCategory.name")
+
+    @cached_property
+    def summary(self) -> Optional[str]:
+        return self.fields.get("summary")
+
+    @cached_property
+    def assignee(self) -> Optional[str]:
+        return _assignee(self.fields)
+
+    @cached_property
+    def priority(self) -> Optional[str]:
+        return _get(self.fields, "priority.name")
+
+    @cached_property
+    def labels(self) -> List[str]:
+        return _labels(self.fields)
+
+    @cached_property
+    def components(self) -> List[str]:
+        return _components(self.fields)
+
+    @cached_property
+    def created(self) -> Optional[str]:
+        return self.fields.get("created")
+
+    @cached_property
+    def updated(self) -> Optional[str]:
+        return self.fields.get("updated")
+
+    @cached_property
+    def changelog_item_count(self) -> int:
+        """Anzahl Changelog-Items, ohne pro Eintrag ein ChangeItem zu bauen."""
+        cl = (self.raw.get("changelog") or {}).get("histories") or []
+        return sum(len(hist.get("items") or ()) for hist in cl)
+
+    def to_row(self) -> IssueRow:
+        return parse_issue(self.raw)
+
+
+def parse_ts(val: Optional[str]) -> Optional[datetime]:
+    """Jira-Zeitstempel wie '2024-09-01T10:00:00.000+0000' -> naive UTC-datetime."""
+    if not val:
+        return None
+    try:
+        dt = datetime.strptime(val, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        return None
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 def parse_issue(raw: Dict[str, Any]) -> IssueRow:
     f = raw.get("fields", {}) or {}
 
-    status_category = _get(f, "status.statusCategory.name")
-    comp_names = [c.get("name") for c in (f.get("components") or []) if isinstance(c, dict)]
-    labels = list(f.get("labels") or [])
-
     return IssueRow(
         id=str(raw.get("id") or ""),
         key=str(raw.get("key") or ""),
-        project=_get(f, "project.key") or _get(f, "project.name"),
+        project=_project(f),
         issuetype=_get(f, "issuetype.name"),
         status=_get(f, "status.name"),
-        status_category=status_category,
+        status_category=_get(f, "status.statusCategory.name"),
         summary=f.get("summary"),
-        assignee=_get(f, "assignee.displayName") or _get(f, "assignee.name"),
+        assignee=_assignee(f),
         priority=_get(f, "priority.name"),
-        labels=labels,
-        components=[c for c in comp_names if c],
+        labels=_labels(f),
+        components=_components(f),
         created=f.get("created"),
         updated=f.get("updated"),
     )
@@ -0,0 +1,244 @@
+# src/jira_reporting/planner.py
+from __future__ import annotations
+
+import logging
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterable, Iterator, List, Optional
+
+from .jira_api import JiraClient
+from .parse import parse_ts
+
+log = logging.getLogger(__name__)
+
+# Ab dieser Trefferzahl wird eine JQL in created-Fenster zerlegt
+DEFAULT_MAX_WINDOW = 10_000
+# Feinste Auflösung von JQL-Datumsliteralen ("yyyy/MM/dd HH:mm")
+MIN_SPAN = timedelta(minutes=1)
+# Parallelbetrieb: so viele Seiten puffert jedes laufende Fenster höchstens vor
+BUFFER_PAGES = 2
+
+_DONE = object()
+
+_ORDER_BY_RE = re.compile(r"(?:^|(?<=\s))ORDER\s+BY\b.*$", re.IGNORECASE | re.DOTALL)
+_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'', re.DOTALL)
+
+
+@dataclass(frozen=True)
+class Window:
+    """Halboffenes created-Fenster [lower, upper); None = unbeschränkt."""
+    lower: Optional[datetime]
+    upper: Optional[datetime]
+    count: int
+
+    def clause(self) -> str:
+        parts = []
+        if self.lower is not None:
+            parts.append(f'created >= "{_jql_date(self.lower)}"')
+        if self.upper is not None:
+            parts.append(f'created < "{_jql_date(self.upper)}"')
+        return " AND ".join(parts)
+
+
+def _jql_date(dt: datetime) -> str:
+    return dt.strftime("%Y/%m/%d %H:%M")
+
+
+def split_order_by(jql: str) -> tuple[str, str]:
+    """Trennt 'ORDER BY ...' ab: ('project = A', 'ORDER BY updated ASC'). String-Literale werden übersprungen."""
+    # Literale maskieren (gleiche Länge), damit 'summary ~ "order by"' nicht als Sortierung zählt
+    masked = _STRING_RE.sub(lambda m: "_" * len(m.group(0)), jql)
+    m = _ORDER_BY_RE.search(masked)
+    if not m:
+        return jql.strip(), ""
+    return jql[: m.start()].strip(), jql[m.start():].strip()
+
+
+def and_jql(base: str, clause: str) -> str:
+    """'(base) AND clause'; mit leerer Basis (z.B. JQL nur aus ORDER BY) nur die Klausel."""
+    if not base:
+        return clause
+    if not clause:
+        return base
+    return f"({base}) AND {clause}"
+
+
+def window_jql(jql: str, window: Window) -> str:
+    base, order_by = split_order_by(jql)
+    return f"{and_jql(base, window.clause())} {order_by}".strip()
+
+
+class QueryPlanner:
+    """
+    Zerlegt eine JQL anhand von 'created' in disjunkte Fenster mit höchstens
+    max_window Treffern (per maxResults=0-Count-Probe, rekursiv halbiert).
+    Das erste/letzte Fenster bleibt nach unten/oben offen, damit Zeitzonen-
+    Unterschiede zwischen Client und Jira-Profil nichts verlieren.
+    """
+
+    def __init__(self, client: JiraClient, *, max_window: int = DEFAULT_MAX_WINDOW) -> None:
+        self.client = client
+        self.max_window = max_window
+
+    def _count(self, jql: str, window: Window) -> int:
+        return self.client.count_issues(window_jql(jql, window))
+
+    def _edge_created(self, base: str, direction: str) -> Optional[datetime]:
+        data = self.client.search_page(
+            jql=f"{base} ORDER BY created {direction}".strip(), max_results=1, fields=["created"]
+        )
+        issues = data.get("issues") or []
+        if not issues:
+            return None
+        return parse_ts((issues[0].get("fields") or {}).get("created"))
+
+    def plan(self, jql: str) -> List[Window]:
+        root = Window(None, None, self.client.count_issues(jql))
+        if root.count <= self.max_window:
+            return [root]
+
+        base, _ = split_order_by(jql)
+        first = self._edge_created(base, "ASC")
+        last = self._edge_created(base, "DESC")
+        if first is None or last is None:
+            log.warning("Kein created-Bereich ermittelbar; JQL wird nicht zerlegt")
+            return [root]
+        last += MIN_SPAN  # obere Grenze ist exklusiv
+
+        windows: List[Window] = []
+        self._split(jql, root, first, last, windows)
+        log.info("JQL in Fenster zerlegt", extra={"windows": len(windows), "total": root.count})
+        return windows
+
+    def _split(self, jql: str, win: Window, first: datetime, last: datetime, out: List[Window]) -> None:
+        lo = win.lower or first
+        hi = win.upper or last
+        if win.count <= self.max_window or hi - lo <= MIN_SPAN:
+            if win.count > self.max_window:
+                log.warning("Fenster nicht weiter teilbar", extra={"window": win.clause(), "count": win.count})
+            out.append(win)
+            return
+        mid = lo + (hi - lo) / 2
+        mid = mid.replace(second=0, microsecond=0)
+        if mid <= lo:
+            mid = lo + MIN_SPAN
+        left = Window(win.lower, mid, self._count(jql, Window(win.lower, mid, 0)))
+        # rechte Hälfte per Differenz – spart einen Count-Call
+        right = Window(mid, win.upper, max(win.count - left.count, 0))
+        self._split(jql, left, first, last, out)
+        self._split(jql, right, first, last, out)
+
+
+class _WindowFailed:
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def search_partitioned(
+    client: JiraClient,
+    *,
+    jql: str,
+    max_window: int = DEFAULT_MAX_WINDOW,
+    page_size: int = 100,
+    fields: Optional[List[str]] = None,
+    expand: Optional[List[str]] = None,
+    workers: int = 1,
+) -> Iterator[Dict]:
+    """
+    Plant die Fenster und streamt alle Issues als einen deduplizierten Strom.
+    Mit workers > 1 laufen bis zu `workers` Fenster gleichzeitig; jedes schreibt über
+    eine begrenzte Queue (BUFFER_PAGES * page_size Issues), die Ausgabe bleibt in
+    Fenster-Reihenfolge. Speicher: höchstens workers * BUFFER_PAGES * page_size Issues,
+    unabhängig von max_window.
+    """
+    windows = QueryPlanner(client, max_window=max_window).plan(jql)
+
+    def run(win: Window) -> Iterable[Dict]:
+        return client.search_issues_stream(
+            jql=window_jql(jql, win), page_size=page_size, fields=fields, expand=expand
+        )
+
+    seen: set[str] = set()
+
+    def dedup(issues: Iterable[Dict]) -> Iterator[Dict]:
+        for issue in issues:
+            key = issue.get("key") or issue.get("id")
+            if key in seen:
+                continue
+            seen.add(key)
+            yield issue
+
+    if workers <= 1 or len(windows) <= 1:
+        for win in windows:
+            yield from dedup(run(win))
+        return
+
+    stop = threading.Event()
+
+    def put(q: "queue.Queue", item: object) -> bool:
+        # blockiert, solange der Konsument hinterherhinkt; bricht ab, wenn der Strom geschlossen wird
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(win: Window, q: "queue.Queue") -> None:
+        try:
+            for issue in run(win):
+                if not put(q, issue):
+                    return
+        except BaseException as e:
+            put(q, _WindowFailed(e))
+            return
+        put(q, _DONE)
+
+    def drain(q: "queue.Queue") -> Iterator[Dict]:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _WindowFailed):
+                raise item.exc
+            yield item
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        pending: Deque["queue.Queue"] = deque()
+        todo = iter(windows)
+
+        def submit_next() -> None:
+            win = next(todo, None)
+            if win is not None:
+                q: "queue.Queue" = queue.Queue(maxsize=BUFFER_PAGES * page_size)
+                pool.submit(produce, win, q)
+                pending.append(q)
+
+        for _ in range(workers):
+            submit_next()
+        while pending:
+            q = pending.popleft()
+            yield from dedup(drain(q))
+            submit_next()
+    finally:
+        stop.set()
+        pool.shutdown(wait=True)
+
+
+__all__ = [
+    "BUFFER_PAGES",
+    "DEFAULT_MAX_WINDOW",
+    "QueryPlanner",
+    "Window",
+    "and_jql",
+    "search_partitioned",
+    "split_order_by",
+    "window_jql",
+]
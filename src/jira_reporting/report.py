@@ -0,0 +1,310 @@
+# src/jira_reporting/report.py
+from __future__ import annotations
+
+import csv
+import json
+import math
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .parse import IssueRow, parse_ts
+
+# Gruppierbare Dimensionen -> Attribut auf IssueRow/IssueView
+GROUP_FIELDS = {
+    "project": "project",
+    "type": "issuetype",
+    "issuetype": "issuetype",
+    "status": "status",
+    "status_category": "status_category",
+    "assignee": "assignee",
+    "priority": "priority",
+    "component": "components",  # mehrwertig: ein Issue zählt in jeder seiner Komponenten
+    "label": "labels",          # dito
+}
+# Jira-Felder, die für die jeweilige Dimension abgefragt werden müssen
+JIRA_FIELDS = {
+    "project": "project",
+    "type": "issuetype",
+    "issuetype": "issuetype",
+    "status": "status",
+    "status_category": "status",
+    "assignee": "assignee",
+    "priority": "priority",
+    "component": "components",
+    "label": "labels",
+}
+NONE_LABEL = "(none)"
+DEFAULT_QUANTILES = (0.5, 0.9)
+
+
+class QuantileSketch:
+    """
+    Mergebarer Quantil-Sketch mit relativer Genauigkeit (DDSketch-Prinzip):
+    Werte landen in logarithmischen Buckets, Speicher wächst nur mit dem
+    Wertebereich, nicht mit der Anzahl Issues.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 0:
+            self.zeros += 1
+            return
+        idx = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[idx] = self.buckets.get(idx, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("QuantileSketch.merge: unterschiedliche relative_accuracy")
+        self.count += other.count
+        self.zeros += other.zeros
+        for idx, n in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + n
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+        seen = self.zeros
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen > rank:
+                return 2 * self._gamma ** idx / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "zeros": self.zeros,
+            "count": self.count,
+            "buckets": {str(k): v for k, v in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "QuantileSketch":
+        sk = cls(state["relative_accuracy"])
+        sk.zeros = state["zeros"]
+        sk.count = state["count"]
+        sk.buckets = {int(k): v for k, v in state["buckets"].items()}
+        return sk
+
+
+class Stat:
+    """count/sum/min/max + Quantil-Sketch für eine Kennzahl (z.B. Alter in Tagen)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.sketch = QuantileSketch()
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.sketch.add(value)
+
+    def merge(self, other: "Stat") -> None:
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": self.sum, "min": self.min, "max": self.max, "sketch": self.sketch.to_state()}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Stat":
+        st = cls()
+        st.count, st.sum, st.min, st.max = state["count"], state["sum"], state["min"], state["max"]
+        st.sketch = QuantileSketch.from_state(state["sketch"])
+        return st
+
+
+class Group:
+    """Aggregat einer Gruppe: Anzahl Issues, Alter (seit created) und Liegezeit (seit updated)."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.age_days = Stat()
+        self.idle_days = Stat()
+
+    def merge(self, other: "Group") -> None:
+        self.count += other.count
+        self.age_days.merge(other.age_days)
+        self.idle_days.merge(other.idle_days)
+
+
+class Aggregator:
+    """
+    Streaming-Group-By über IssueRow/IssueView in einem Durchlauf.
+    Speicher ist proportional zur Anzahl Gruppen, nicht zur Anzahl Issues;
+    Teil-Aggregate paralleler Shards lassen sich per merge()/to_state() zusammenführen.
+    """
+
+    def __init__(self, group_by: Sequence[str], *, now: Optional[datetime] = None) -> None:
+        unknown = [g for g in group_by if g not in GROUP_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown group-by field(s): {', '.join(unknown)} (allowed: {', '.join(GROUP_FIELDS)})")
+        self.group_by = tuple(group_by)
+        self.now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        self.groups: Dict[Tuple[str, ...], Group] = {}
+        # Bezugszeitpunkte der enthaltenen Daten (min, max); Shards können zu verschiedenen
+        # Zeitpunkten gemessen sein – der Bereich wird in der Ausgabe als as_of_min/as_of_max ausgewiesen.
+        self.as_of: Optional[Tuple[datetime, datetime]] = None
+
+    def _keys(self, row: Any) -> List[Tuple[str, ...]]:
+        keys: List[Tuple[str, ...]] = [()]
+        for g in self.group_by:
+            val = getattr(row, GROUP_FIELDS[g])
+            if isinstance(val, list):
+                vals = [str(v) for v in val] or [NONE_LABEL]
+            else:
+                vals = [NONE_LABEL if val is None else str(val)]
+            keys = [k + (v,) for k in keys for v in vals]
+        return keys
+
+    def add(self, row: IssueRow | Any) -> None:
+        created = parse_ts(row.created)
+        updated = parse_ts(row.updated)
+        if self.as_of is None:
+            self.as_of = (self.now, self.now)
+        for key in self._keys(row):
+            grp = self.groups.get(key)
+            if grp is None:
+                grp = self.groups[key] = Group()
+            grp.count += 1
+            if created is not None:
+                grp.age_days.add((self.now - created).total_seconds() / 86400)
+            if updated is not None:
+                grp.idle_days.add((self.now - updated).total_seconds() / 86400)
+
+    def add_all(self, rows: Iterable[Any]) -> "Aggregator":
+        for row in rows:
+            self.add(row)
+        return self
+
+    def merge(self, other: "Aggregator") -> None:
+        if other.group_by != self.group_by:
+            raise ValueError("Aggregator.merge: unterschiedliche group_by")
+        if other.as_of is not None:
+            if self.as_of is None:
+                self.as_of = other.as_of
+            else:
+                self.as_of = (min(self.as_of[0], other.as_of[0]), max(self.as_of[1], other.as_of[1]))
+        for key, grp in other.groups.items():
+            mine = self.groups.get(key)
+            if mine is None:
+                mine = self.groups[key] = Group()
+            mine.merge(grp)
+
+    # Serialisierung (für Shards)
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "group_by": list(self.group_by),
+            "now": self.now.isoformat(),
+            "as_of": [t.isoformat() for t in self.as_of] if self.as_of else None,
+            "groups": [
+                {
+                    "key": list(key),
+                    "count": grp.count,
+                    "age_days": grp.age_days.to_state(),
+                    "idle_days": grp.idle_days.to_state(),
+                }
+                for key, grp in self.groups.items()
+            ],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "Aggregator":
+        agg = cls(state["group_by"], now=datetime.fromisoformat(state["now"]))
+        as_of = state.get("as_of")
+        if as_of:
+            agg.as_of = (datetime.fromisoformat(as_of[0]), datetime.fromisoformat(as_of[1]))
+        elif state["groups"]:
+            agg.as_of = (agg.now, agg.now)
+        for item in state["groups"]:
+            grp = Group()
+            grp.count = item["count"]
+            grp.age_days = Stat.from_state(item["age_days"])
+            grp.idle_days = Stat.from_state(item["idle_days"])
+            agg.groups[tuple(item["key"])] = grp
+        return agg
+
+    # Ausgabe
+    def columns(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> List[str]:
+        """Spaltenreihenfolge der Ausgabe – auch ohne Gruppen (CSV-Header für leere Reports)."""
+        cols = list(self.group_by) + ["count", "as_of_min", "as_of_max"]
+        for name in ("age_days", "idle_days"):
+            cols += [f"{name}_sum", f"{name}_min", f"{name}_max"]
+            cols += [f"{name}_p{_qlabel(q)}" for q in quantiles]
+        return cols
+
+    def results(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> List[Dict[str, Any]]:
+        out = []
+        as_of_min, as_of_max = (t.isoformat() for t in self.as_of) if self.as_of else (None, None)
+        for key in sorted(self.groups):
+            grp = self.groups[key]
+            rec: Dict[str, Any] = dict(zip(self.group_by, key))
+            rec["count"] = grp.count
+            rec["as_of_min"] = as_of_min
+            rec["as_of_max"] = as_of_max
+            for name, st in (("age_days", grp.age_days), ("idle_days", grp.idle_days)):
+                rec[f"{name}_sum"] = _round(st.sum)
+                rec[f"{name}_min"] = _round(st.min)
+                rec[f"{name}_max"] = _round(st.max)
+                for q in quantiles:
+                    rec[f"{name}_p{_qlabel(q)}"] = _round(st.sketch.quantile(q))
+            out.append(rec)
+        return out
+
+    def write_json(self, fh: IO[str], quantiles: Sequence[float] = DEFAULT_QUANTILES) -> None:
+        json.dump(self.results(quantiles), fh, ensure_ascii=False, indent=2)
+        fh.write("\n")
+
+    def write_csv(self, fh: IO[str], quantiles: Sequence[float] = DEFAULT_QUANTILES) -> None:
+        writer = csv.DictWriter(fh, fieldnames=self.columns(quantiles))
+        writer.writeheader()
+        writer.writerows(self.results(quantiles))
+
+
+def fields_for(group_by: Sequence[str]) -> List[str]:
+    """Minimale /search-Feldliste für ein Report mit diesen Dimensionen."""
+    out = ["created", "updated"]
+    for g in group_by:
+        f = JIRA_FIELDS.get(g)
+        if f and f not in out:
+            out.append(f)
+    return out
+
+
+def _round(val: Optional[float]) -> Optional[float]:
+    return None if val is None else round(val, 2)
+
+
+def _qlabel(q: float) -> str:
+    return f"{q * 100:g}".replace(".", "_")
+
+
+__all__ = [
+    "Aggregator",
+    "DEFAULT_QUANTILES",
+    "GROUP_FIELDS",
+    "fields_for",
+    "QuantileSketch",
+    "Stat",
+]
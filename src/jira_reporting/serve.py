@@ -0,0 +1,333 @@
+# src/jira_reporting/serve.py
+from __future__ import annotations
+
+import hmac
+import json
+import logging
+import math
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Protocol, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .jira_api import JiraClient
+from .parse import parse_ts
+from .planner import and_jql, split_order_by
+
+log = logging.getLogger(__name__)
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Obergrenze für Webhook-Bodies (Jira-Issue-Payloads liegen typisch deutlich darunter)
+MAX_BODY_BYTES = 1024 * 1024
+
+# Jira-Webhook-Events -> Operation
+EVENT_OPS = {
+    "jira:issue_created": UPSERT,
+    "jira:issue_updated": UPSERT,
+    "jira:issue_deleted": DELETE,
+}
+
+
+class Sink(Protocol):
+    def upsert(self, issue: Dict) -> None: ...
+    def delete(self, key: str) -> None: ...
+
+
+class JsonlSink:
+    """Hängt jede Änderung als NDJSON-Zeile an: {"op": "upsert", "issue": {...}} bzw. {"op": "delete", "key": ...}."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _write(self, record: Dict) -> None:
+        with self._lock, self.path.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def upsert(self, issue: Dict) -> None:
+        self._write({"op": UPSERT, "issue": issue})
+
+    def delete(self, key: str) -> None:
+        self._write({"op": DELETE, "key": key})
+
+
+class EventQueue:
+    """
+    Thread-sichere Queue, die Events pro Issue-Key zusammenfasst: zehn Updates auf
+    denselben Key werden zu einem Re-Fetch, ein Delete überschreibt vorherige Updates.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, str] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, key: str, op: str, *, replace: bool = True) -> None:
+        with self._cond:
+            if not replace and key in self._pending:
+                return
+            self._pending.pop(key, None)  # Einfüge-Reihenfolge = letztes Event
+            self._pending[key] = op
+            self._cond.notify()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def wait(self, timeout: float) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: bool(self._pending) or self._closed, timeout=timeout)
+
+    def close(self) -> None:
+        """Weckt wartende Worker auf (beim Stoppen des Service)."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def drain(self) -> Dict[str, str]:
+        with self._cond:
+            pending, self._pending = self._pending, {}
+            return pending
+
+
+def parse_webhook(payload: Dict) -> Optional[Tuple[str, str]]:
+    """Jira-Webhook-Body -> (issue_key, op) oder None, wenn das Event uns nicht interessiert."""
+    op = EVENT_OPS.get(payload.get("webhookEvent") or "")
+    key = (payload.get("issue") or {}).get("key")
+    if op is None or not key:
+        return None
+    return key, op
+
+
+class WebhookService:
+    """
+    Lokaler Empfänger für Jira-Issue-Webhooks.
+    - HTTP-Thread: nimmt POSTs an und legt (key, op) in die EventQueue
+    - Worker-Thread: sammelt flush_interval Sekunden, lädt die berührten Issues gebündelt
+      (JiraClient.get_issues_bulk) nach und schreibt sie in den Sink
+    - optionaler Sweep: inkrementelle JQL seit dem letzten erfolgreichen Sweep als Sicherheitsnetz
+      für verlorene Events; läuft auch direkt beim Start. Mit state_path überlebt der Zeitpunkt
+      einen Neustart, sodass auch Änderungen während einer Downtime nachgeholt werden.
+    """
+
+    def __init__(
+        self,
+        client: JiraClient,
+        sink: Sink,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        fields: Optional[List[str]] = None,
+        token: Optional[str] = None,
+        flush_interval: float = 5.0,
+        sweep_jql: Optional[str] = None,
+        sweep_interval: float = 600.0,
+        state_path: Optional[str | Path] = None,
+    ) -> None:
+        self.client = client
+        self.sink = sink
+        self.fields = fields
+        self.token = token
+        self.flush_interval = flush_interval
+        self.sweep_jql = sweep_jql
+        self.sweep_interval = sweep_interval
+        self.state_path = Path(state_path) if state_path else None
+        self.last_sweep: Optional[datetime] = self._load_last_sweep()
+        # zuletzt angewendeter 'updated'-Stand pro Key – der Sweep lädt nur neuere Issues nach
+        self._applied: Dict[str, datetime] = {}
+        self._applied_lock = threading.Lock()
+        self.queue = EventQueue()
+        self._stop = threading.Event()
+        self._serving = False
+        self._threads: List[threading.Thread] = []
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def server_address(self) -> Tuple[str, int]:
+        host, port = self.httpd.server_address[:2]
+        return host, port
+
+    def _make_handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 (http.server-API)
+                if service.token is not None:
+                    token = (parse_qs(urlparse(self.path).query).get("token") or [""])[0]
+                    if not hmac.compare_digest(token.encode("utf-8"), service.token.encode("utf-8")):
+                        self.send_error(403)
+                        return
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    self.send_error(400, "invalid Content-Length")
+                    return
+                if length > MAX_BODY_BYTES:
+                    self.send_error(413)
+                    return
+                try:
+                    payload = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self.send_error(400, "invalid JSON")
+                    return
+                event = parse_webhook(payload) if isinstance(payload, dict) else None
+                if event is not None:
+                    service.queue.put(*event)
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, format: str, *args) -> None:
+                log.debug("webhook %s", format % args)
+
+        return Handler
+
+    # Verarbeitung
+    def flush(self) -> int:
+        """Verarbeitet alle anstehenden Events; liefert die Anzahl angewendeter Änderungen."""
+        pending = self.queue.drain()
+        if not pending:
+            return 0
+        upserts = [k for k, op in pending.items() if op == UPSERT]
+        applied = 0
+        for key, op in pending.items():
+            if op == DELETE:
+                self.sink.delete(key)
+                with self._applied_lock:
+                    self._applied.pop(key, None)
+                applied += 1
+        try:
+            for issue in self.client.get_issues_bulk(upserts, self.fields):
+                self.sink.upsert(issue)
+                updated = parse_ts((issue.get("fields") or {}).get("updated"))
+                if updated is not None:
+                    with self._applied_lock:
+                        self._applied[issue["key"]] = updated
+                applied += 1
+        except Exception:
+            # Keys zurücklegen – beim nächsten Batch erneut versuchen (Upserts sind idempotent)
+            for key in upserts:
+                self.queue.put(key, UPSERT, replace=False)
+            raise
+        log.info("Webhook batch applied", extra={"events": len(pending), "applied": applied})
+        return applied
+
+    def _load_last_sweep(self) -> Optional[datetime]:
+        if self.state_path is None or not self.state_path.is_file():
+            return None
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            return datetime.fromisoformat(state["last_sweep"])
+        except (ValueError, KeyError, TypeError):
+            log.warning("Sweep-State unlesbar, starte ohne", extra={"path": str(self.state_path)})
+            return None
+
+    def _save_last_sweep(self) -> None:
+        if self.state_path is None or self.last_sweep is None:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp.write_text(json.dumps({"last_sweep": self.last_sweep.isoformat()}), encoding="utf-8")
+        tmp.replace(self.state_path)
+
+    def _sweep_minutes(self, now: datetime) -> int:
+        """Rückblick in Minuten: seit dem letzten erfolgreichen Sweep (+1 min Überlappung)."""
+        if self.last_sweep is None:
+            return math.ceil(self.sweep_interval / 60) + 1
+        return math.ceil((now - self.last_sweep).total_seconds() / 60) + 1
+
+    def sweep(self) -> int:
+        """
+        Inkrementelle JQL seit dem letzten erfolgreichen Sweep; Issues, deren 'updated' neuer ist
+        als der zuletzt angewendete Stand, landen in der Queue. Der Zeitraum wird relativ
+        ('updated >= -Nm') formuliert, weil absolute JQL-Daten in der Profil-Zeitzone des
+        Jira-Users ausgewertet würden.
+        """
+        if not self.sweep_jql:
+            return 0
+        started = datetime.now(timezone.utc)
+        base, _ = split_order_by(self.sweep_jql)
+        jql = and_jql(base, f'updated >= "-{self._sweep_minutes(started)}m"')
+        n = 0
+        for issue in self.client.search_issues_stream(jql=jql, page_size=100, fields=["updated"]):
+            updated = parse_ts((issue.get("fields") or {}).get("updated"))
+            with self._applied_lock:
+                known = self._applied.get(issue["key"])
+            if known is not None and updated is not None and updated <= known:
+                continue  # schon per Webhook angewendet
+            self.queue.put(issue["key"], UPSERT, replace=False)
+            n += 1
+        # erst nach vollständigem Durchlauf fortschreiben – ein fehlgeschlagener Sweep hinterlässt keine Lücke
+        self.last_sweep = started
+        self._save_last_sweep()
+        log.info("Sweep done", extra={"queued": n})
+        return n
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            self.queue.wait(timeout=self.flush_interval)
+            # kurz sammeln, damit Event-Salven zu einem Batch werden
+            self._stop.wait(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                log.exception("Webhook batch failed")
+
+    def _sweeper(self) -> None:
+        # erster Sweep sofort beim Start: holt nach, was während Downtime/Neustart passiert ist
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception:
+                log.exception("Sweep failed")
+            if self._stop.wait(self.sweep_interval):
+                break
+
+    # Lifecycle
+    def start(self) -> "WebhookService":
+        self._serving = True
+        targets = [self.httpd.serve_forever, self._worker]
+        if self.sweep_jql:
+            targets.append(self._sweeper)
+        for target in targets:
+            t = threading.Thread(target=target, daemon=True)
+            t.start()
+            self._threads.append(t)
+        log.info("Webhook receiver listening", extra={"address": "%s:%d" % self.server_address})
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.queue.close()
+        if self._serving:  # shutdown() blockiert, wenn serve_forever nie lief
+            self.httpd.shutdown()
+            self._serving = False
+        self.httpd.server_close()
+        for t in self._threads:
+            t.join(timeout=5)
+        try:
+            self.flush()  # Rest nicht verlieren
+        except Exception:
+            log.exception("Final webhook batch failed", extra={"pending": len(self.queue)})
+
+    def __enter__(self) -> "WebhookService":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+__all__ = [
+    "EventQueue",
+    "JsonlSink",
+    "Sink",
+    "WebhookService",
+    "parse_webhook",
+]
@@ -0,0 +1,52 @@
+# tests/test_cli.py
+from __future__ import annotations
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from jira_reporting.config import _resolve_dotenv
+from jira_reporting.main import main
+
+HEAVY = {"httpx", "dotenv", "jira_reporting.config", "jira_reporting.jira_api", "jira_reporting.extract"}
+
+
+def _imported_modules(*args: str) -> set[str]:
+    """Startet die CLI mit -X importtime und liefert die Namen aller importierten Module."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "jira_reporting", *args],
+        capture_output=True,
+        text=True,
+    )
+    mods = set()
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            mods.add(line.rsplit("|", 1)[1].strip())
+    return mods
+
+
+@pytest.mark.parametrize("args", [("--help",), ("extract", "--help"), ("extract",)])
+def test_cli_help_and_arg_errors_skip_heavy_imports(args):
+    mods = _imported_modules(*args)
+    assert "jira_reporting.main" in mods
+    assert not (HEAVY & mods)
+
+
+def test_cli_rejects_unknown_command():
+    with pytest.raises(SystemExit):
+        main(["nope"])
+
+
+def test_resolve_dotenv_is_memoized(tmp_path):
+    env = tmp_path / "custom.env"
+    env.write_text("JIRA_BASE_URL=https://x\n", encoding="utf-8")
+    _resolve_dotenv.cache_clear()
+    try:
+        found, tried = _resolve_dotenv(str(env), str(tmp_path))
+        assert found == Path(env) and tried[0] == Path(env)
+        assert _resolve_dotenv(str(env), str(tmp_path))[0] == Path(env)
+        info = _resolve_dotenv.cache_info()
+        assert (info.hits, info.misses) == (1, 1)
+    finally:
+        _resolve_dotenv.cache_clear()
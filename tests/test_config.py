@@ -0,0 +1,40 @@
+# tests/test_config.py
+from __future__ import annotations
+import httpx
+from jira_reporting.config import Settings, shared_client, close_shared_clients
+
+
+def test_from_env_pool_settings(monkeypatch, tmp_path):
+    monkeypatch.setenv("JIRA_BASE_URL", "https://jira.example.com/")
+    monkeypatch.setenv("JIRA_PAT", "x")
+    monkeypatch.setenv("JIRA_MAX_CONNECTIONS", "50")
+    monkeypatch.setenv("JIRA_KEEPALIVE_EXPIRY_S", "90")
+    monkeypatch.setenv("JIRA_COMPRESSION", "false")
+    s = Settings.from_env(env_path=tmp_path / "missing.env")
+    assert s.base_url == "https://jira.example.com"
+    assert s.max_connections == 50
+    assert s.keepalive_expiry_s == 90.0
+    assert s.http2 is False
+    client = s.build_client(transport=httpx.MockTransport(lambda r: httpx.Response(200)))
+    assert client.headers["Accept-Encoding"] == "identity"
+
+
+def test_settings_parent_fields_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("JIRA_BASE_URL", "https://jira.local")
+    monkeypatch.setenv("JIRA_PAT", "t")
+    monkeypatch.setenv("JIRA_PARENT_FIELDS", "parent, customfield_10008")
+    assert Settings.from_env(env_path=tmp_path / "none.env").parent_fields == ("parent", "customfield_10008")
+
+
+def test_shared_client_is_reused_per_settings():
+    s = Settings(base_url="https://jira.example.com", pat="t")
+    try:
+        c1 = shared_client(s)
+        assert shared_client(Settings(base_url="https://jira.example.com", pat="t")) is c1
+        # jql/page_size ändern den Transport nicht -> gleicher Pool
+        assert shared_client(Settings(base_url="https://jira.example.com", pat="t", jql="x", page_size=5)) is c1
+        assert shared_client(Settings(base_url="https://jira.example.com", pat="t", max_connections=5)) is not c1
+        assert shared_client(Settings(base_url="https://other.example.com", pat="t")) is not c1
+    finally:
+        close_shared_clients()
+    assert c1.is_closed
@@ -1,5 +1,5 @@
 # tests/test_parse.py
-from jira_reporting.parse import parse_issue, iter_changelog_items
+from jira_reporting.parse import IssueView, parse_issue, iter_changelog_items
 
 def test_parse_issue_minimal():
     raw = {
@@ -47,3 +47,16 @@ def test_iter_changelog_items_flatten():
     assert it.from_string == "To Do"
     assert it.to_string == "In Progress"
     assert it.author == "User One"
+
+def test_issue_view_lazy_fields_and_changelog_count():
+    raw = {
+        "key": "ABC-2",
+        "fields": {"status": {"name": "Done"}, "assignee": {"name": "u1"}},
+        "changelog": {"histories": [{"items": [{"field": "status"}, {"field": "assignee"}]}, {"items": []}]},
+    }
+    view = IssueView(raw)
+    assert view.status == "Done"
+    assert "components" not in vars(view)  # noch nicht dekodiert
+    assert view.assignee == "u1"
+    assert view.changelog_item_count == 2
+    assert view.to_row() == parse_issue(raw)
@@ -0,0 +1,86 @@
+# tests/test_planner.py
+from __future__ import annotations
+import json
+import re
+from datetime import datetime, timedelta
+import httpx
+from jira_reporting.config import Settings
+from jira_reporting.jira_api import JiraClient
+from jira_reporting.planner import QueryPlanner, search_partitioned, split_order_by
+
+BASE = datetime(2024, 1, 1)
+ISSUES = [
+    {"key": f"A-{i}", "fields": {"created": (BASE + timedelta(hours=7 * i)).strftime("%Y-%m-%dT%H:%M:%S.000+0000")}}
+    for i in range(40)
+]
+
+
+def _created(issue: dict) -> datetime:
+    return datetime.strptime(issue["fields"]["created"][:19], "%Y-%m-%dT%H:%M:%S")
+
+
+def make_client(calls: list[dict]) -> JiraClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content.decode("utf-8"))
+        calls.append(body)
+        jql = body["jql"]
+        hits = list(ISSUES)
+        if m := re.search(r'created >= "([^"]+)"', jql):
+            lo = datetime.strptime(m.group(1), "%Y/%m/%d %H:%M")
+            hits = [i for i in hits if _created(i) >= lo]
+        if m := re.search(r'created < "([^"]+)"', jql):
+            hi = datetime.strptime(m.group(1), "%Y/%m/%d %H:%M")
+            hits = [i for i in hits if _created(i) < hi]
+        if jql.endswith("created DESC"):
+            hits.reverse()
+        start, size = body["startAt"], body["maxResults"]
+        return httpx.Response(200, json={"total": len(hits), "issues": hits[start:start + size]})
+
+    s = Settings(base_url="https://jira.local", pat="t", timeout_s=5.0)
+    return JiraClient(s, client=s.build_client(transport=httpx.MockTransport(handler)))
+
+
+def test_split_order_by():
+    assert split_order_by("project = A order by updated ASC") == ("project = A", "order by updated ASC")
+    assert split_order_by("project = A") == ("project = A", "")
+
+
+def test_plan_small_query_is_single_window():
+    calls: list[dict] = []
+    windows = QueryPlanner(make_client(calls), max_window=100).plan("project = A")
+    assert len(windows) == 1 and windows[0].count == 40
+    assert calls[0]["maxResults"] == 0
+
+
+def test_plan_splits_until_windows_fit():
+    windows = QueryPlanner(make_client([]), max_window=8).plan("project = A ORDER BY created ASC")
+    assert len(windows) > 1
+    assert all(w.count <= 8 for w in windows)
+    assert sum(w.count for w in windows) == 40
+    assert windows[0].lower is None and windows[-1].upper is None
+
+
+def test_search_partitioned_parallel_merges_all_issues():
+    got = list(search_partitioned(make_client([]), jql="project = A", max_window=8, page_size=3, workers=3))
+    assert [i["key"] for i in got] == [i["key"] for i in ISSUES]
+
+
+def test_search_partitioned_parallel_stops_cleanly_when_closed():
+    stream = search_partitioned(make_client([]), jql="project = A", max_window=8, page_size=3, workers=3)
+    first = [next(stream)["key"] for _ in range(4)]
+    stream.close()  # Producer-Threads dürfen nicht an vollen Queues hängen bleiben
+    assert first == ["A-0", "A-1", "A-2", "A-3"]
+
+
+def test_split_order_by_ignores_string_literals_and_leading_order_by():
+    from jira_reporting.planner import Window, window_jql
+
+    w = Window(datetime(2024, 1, 1), None, 0)
+    assert split_order_by('summary ~ "sort order by rank"') == ('summary ~ "sort order by rank"', "")
+    assert window_jql('summary ~ "sort order by rank"', w) == '(summary ~ "sort order by rank") AND created >= "2024/01/01 00:00"'
+    assert split_order_by("ORDER BY created") == ("", "ORDER BY created")
+    assert window_jql("ORDER BY created", w) == 'created >= "2024/01/01 00:00" ORDER BY created'
+    assert window_jql("ORDER BY created", Window(None, None, 0)) == "ORDER BY created"
+    assert split_order_by("project = A AND text ~ 'x order by y' order by key") == (
+        "project = A AND text ~ 'x order by y'", "order by key"
+    )
@@ -0,0 +1,112 @@
+# tests/test_report.py
+from __future__ import annotations
+import json
+from datetime import datetime
+from jira_reporting.main import main
+from jira_reporting.parse import IssueView
+from jira_reporting.report import Aggregator, QuantileSketch, fields_for
+
+NOW = datetime(2024, 9, 11)
+
+
+def raw(key: str, project: str, itype: str, created_day: int, components=()):
+    return {
+        "key": key,
+        "fields": {
+            "project": {"key": project},
+            "issuetype": {"name": itype},
+            "components": [{"name": c} for c in components],
+            "created": f"2024-09-{created_day:02d}T00:00:00.000+0000",
+            "updated": "2024-09-10T00:00:00.000+0000",
+        },
+    }
+
+
+ISSUES = [
+    raw("A-1", "A", "Bug", 1, ["UI"]),
+    raw("A-2", "A", "Bug", 5, ["UI", "API"]),
+    raw("A-3", "A", "Story", 9),
+    raw("B-1", "B", "Bug", 10),
+]
+
+
+def test_group_by_counts_and_age():
+    agg = Aggregator(["project", "type"], now=NOW).add_all(IssueView(r) for r in ISSUES)
+    res = {(r["project"], r["type"]): r for r in agg.results()}
+    assert res[("A", "Bug")]["count"] == 2
+    assert res[("A", "Bug")]["age_days_min"] == 6.0
+    assert res[("A", "Bug")]["age_days_max"] == 10.0
+    assert res[("B", "Bug")]["idle_days_sum"] == 1.0
+
+
+def test_multivalued_component_and_none():
+    agg = Aggregator(["component"], now=NOW).add_all(IssueView(r) for r in ISSUES)
+    counts = {r["component"]: r["count"] for r in agg.results()}
+    assert counts == {"(none)": 2, "API": 1, "UI": 2}
+
+
+def test_merge_shards_equals_single_pass():
+    full = Aggregator(["project"], now=NOW).add_all(IssueView(r) for r in ISSUES)
+    a = Aggregator(["project"], now=NOW).add_all(IssueView(r) for r in ISSUES[:2])
+    b = Aggregator(["project"], now=NOW).add_all(IssueView(r) for r in ISSUES[2:])
+    a.merge(Aggregator.from_state(json.loads(json.dumps(b.to_state()))))
+    assert a.results() == full.results()
+
+
+def test_quantile_sketch_relative_error():
+    sk = QuantileSketch(relative_accuracy=0.01)
+    for v in range(1, 1001):
+        sk.add(float(v))
+    assert abs(sk.quantile(0.5) - 500) / 500 < 0.02
+    assert abs(sk.quantile(0.9) - 900) / 900 < 0.02
+
+
+def test_fields_for():
+    assert fields_for(["project", "component", "type"]) == ["created", "updated", "project", "components", "issuetype"]
+
+
+def test_cli_report_merge(tmp_path, capsys):
+    state = tmp_path / "shard.json"
+    agg = Aggregator(["project"], now=NOW).add_all(IssueView(r) for r in ISSUES)
+    state.write_text(json.dumps(agg.to_state()), encoding="utf-8")
+    assert main(["report", "--group-by", "project", "--merge", str(state), "--format", "json"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert [(r["project"], r["count"]) for r in out] == [("A", 3), ("B", 1)]
+
+
+def test_cli_report_merge_group_by_from_state_and_mismatch(tmp_path, capsys):
+    state = tmp_path / "status.json"
+    agg = Aggregator(["type"], now=NOW).add_all(IssueView(r) for r in ISSUES)
+    state.write_text(json.dumps(agg.to_state()), encoding="utf-8")
+    assert main(["report", "--merge", str(state), "--format", "json"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert [(r["type"], r["count"]) for r in out] == [("Bug", 3), ("Story", 1)]
+    assert main(["report", "--group-by", "project", "--merge", str(state)]) == 2
+
+
+def test_merge_records_reference_time_range():
+    later = datetime(2024, 9, 12)
+    a = Aggregator(["project"], now=NOW).add_all(IssueView(r) for r in ISSUES[:2])
+    b = Aggregator(["project"], now=later).add_all(IssueView(r) for r in ISSUES[2:])
+    merged = Aggregator(["project"])
+    merged.merge(a)
+    merged.merge(b)
+    row = merged.results()[0]
+    assert (row["as_of_min"], row["as_of_max"]) == (NOW.isoformat(), later.isoformat())
+
+
+def test_cli_report_rejects_bad_group_by_and_quantiles(tmp_path):
+    state = tmp_path / "shard.json"
+    state.write_text(json.dumps(Aggregator(["project"], now=NOW).to_state()), encoding="utf-8")
+    assert main(["report", "--group-by", "foo", "--merge", str(state)]) == 2
+    assert main(["report", "--quantiles", "x", "--merge", str(state)]) == 2
+    assert main(["report", "--quantiles", "0.5,1.5", "--merge", str(state)]) == 2
+
+
+def test_cli_report_empty_csv_has_header(tmp_path, capsys):
+    state = tmp_path / "empty.json"
+    state.write_text(json.dumps(Aggregator(["project"], now=NOW).to_state()), encoding="utf-8")
+    assert main(["report", "--merge", str(state)]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines == [",".join(Aggregator(["project"]).columns())]
+    assert lines[0].startswith("project,count,as_of_min,as_of_max,age_days_sum")
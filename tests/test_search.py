@@ -36,3 +36,83 @@ def test_search_stream_paginates():
     client.get_myself()
     got = [it["key"] for it in client.search_issues_stream(jql="project = A")]
     assert got == ["A-1", "A-2", "A-3", "A-4", "A-5"]
+
+
+def make_key_client(issues: dict[str, dict], calls: list[str]) -> JiraClient:
+    import re
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content.decode("utf-8"))
+        calls.append(body["jql"])
+        keys = re.findall(r'"([^"]+)"', body["jql"])
+        # Jira liefert nicht in Eingabereihenfolge
+        hits = [issues[k] for k in sorted(keys, reverse=True) if k in issues]
+        return httpx.Response(200, json={"total": len(hits), "issues": hits})
+
+    s = Settings(base_url="https://jira.local", pat="t", timeout_s=5.0)
+    return JiraClient(s, client=s.build_client(transport=httpx.MockTransport(handler)))
+
+
+def test_get_issues_bulk_chunks_and_reorders():
+    issues = {f"A-{i}": {"key": f"A-{i}"} for i in range(10)}
+    calls: list[str] = []
+    client = make_key_client(issues, calls)
+    wanted = ["A-3", "A-1", "X-9", "A-7", "A-1", "A-0", "A-9"]
+    got = [it["key"] for it in client.get_issues_bulk(wanted, ["summary"], chunk_size=2, workers=3)]
+    assert got == ["A-3", "A-1", "A-7", "A-0", "A-9"]
+    assert len(calls) == 3 and all(c.startswith("key in (") for c in calls)
+
+
+def test_hydrate_parents_fetches_missing_in_bulk():
+    from jira_reporting.extract import hydrate_parents
+
+    issues = {
+        "E-1": {"key": "E-1", "fields": {}},
+        "S-1": {"key": "S-1", "fields": {"parent": {"key": "E-1"}}},
+        "S-2": {"key": "S-2", "fields": {"parent": {"key": "E-1"}}},
+    }
+    stream = [
+        {"key": "T-1", "fields": {"parent": {"key": "S-1"}}},
+        {"key": "T-2", "fields": {"parent": {"key": "S-2"}}},
+        {"key": "T-3", "fields": {"parent": {"key": "T-1"}}},
+    ]
+    calls: list[str] = []
+    got = [it["key"] for it in hydrate_parents(make_key_client(issues, calls), stream)]
+    assert got == ["T-1", "T-2", "T-3", "S-1", "S-2", "E-1"]
+    assert len(calls) == 2
+
+
+def test_hydrate_parents_follows_epic_link_field():
+    from jira_reporting.extract import hydrate_parents
+
+    issues = {"E-1": {"key": "E-1", "fields": {}}}
+    stream = [{"key": "S-1", "fields": {"customfield_10008": "E-1"}}]
+    got = [it["key"] for it in hydrate_parents(make_key_client(issues, []), stream, parent_fields=("parent", "customfield_10008"))]
+    assert got == ["S-1", "E-1"]
+
+
+
+def test_get_issues_bulk_is_bounded_and_cancels_on_close():
+    issues = {f"A-{i}": {"key": f"A-{i}"} for i in range(5000)}
+    for ordered in (True, False):
+        calls: list[str] = []
+        stream = make_key_client(issues, calls).get_issues_bulk(list(issues), ["summary"], workers=3, ordered=ordered)
+        next(stream)
+        stream.close()
+        assert len(calls) <= 4  # workers + ein nachgeschobener Chunk, nicht alle 50
+
+
+def test_hydrate_parents_passes_expand():
+    from jira_reporting.extract import hydrate_parents
+
+    bodies: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content.decode("utf-8")))
+        return httpx.Response(200, json={"total": 1, "issues": [{"key": "E-1", "fields": {}}]})
+
+    s = Settings(base_url="https://jira.local", pat="t", timeout_s=5.0)
+    client = JiraClient(s, client=s.build_client(transport=httpx.MockTransport(handler)))
+    stream = [{"key": "S-1", "fields": {"parent": {"key": "E-1"}}}]
+    list(hydrate_parents(client, stream, expand=["changelog"]))
+    assert bodies[0]["expand"] == ["changelog"]
@@ -0,0 +1,199 @@
+# tests/test_serve.py
+from __future__ import annotations
+import json
+import re
+import httpx
+from jira_reporting.config import Settings
+from jira_reporting.jira_api import JiraClient
+from jira_reporting.serve import EventQueue, WebhookService, parse_webhook
+
+
+class MemorySink:
+    def __init__(self) -> None:
+        self.upserts: list[str] = []
+        self.deletes: list[str] = []
+
+    def upsert(self, issue: dict) -> None:
+        self.upserts.append(issue["key"])
+
+    def delete(self, key: str) -> None:
+        self.deletes.append(key)
+
+
+UPDATED = "2024-09-10T12:00:00.000+0000"
+
+
+def make_client(jqls: list[str]) -> JiraClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        jql = json.loads(request.content.decode("utf-8"))["jql"]
+        jqls.append(jql)
+        if "updated >=" in jql:
+            keys = ["S-1"]
+        else:
+            keys = re.findall(r'"([^"]+)"', jql)
+        hits = [{"key": k, "fields": {"updated": UPDATED}} for k in keys]
+        return httpx.Response(200, json={"total": len(hits), "issues": hits})
+
+    s = Settings(base_url="https://jira.local", pat="t", timeout_s=5.0)
+    return JiraClient(s, client=s.build_client(transport=httpx.MockTransport(handler)))
+
+
+def post(service: WebhookService, payload: dict, token: str = "s3cret") -> int:
+    host, port = service.server_address
+    return httpx.post(f"http://{host}:{port}/webhook?token={token}", json=payload).status_code
+
+
+def test_parse_webhook_and_coalescing():
+    assert parse_webhook({"webhookEvent": "jira:issue_updated", "issue": {"key": "A-1"}}) == ("A-1", "upsert")
+    assert parse_webhook({"webhookEvent": "comment_created", "issue": {"key": "A-1"}}) is None
+    q = EventQueue()
+    q.put("A-1", "upsert")
+    q.put("A-2", "upsert")
+    q.put("A-1", "delete")
+    assert q.drain() == {"A-2": "upsert", "A-1": "delete"}
+
+
+def test_webhook_receiver_batches_refetch():
+    jqls: list[str] = []
+    sink = MemorySink()
+    service = WebhookService(make_client(jqls), sink, port=0, token="s3cret", flush_interval=60)
+    with service:
+        for _ in range(3):
+            assert post(service, {"webhookEvent": "jira:issue_updated", "issue": {"key": "A-1"}}) == 204
+        assert post(service, {"webhookEvent": "jira:issue_created", "issue": {"key": "A-2"}}) == 204
+        assert post(service, {"webhookEvent": "jira:issue_deleted", "issue": {"key": "A-3"}}) == 204
+        assert post(service, {"webhookEvent": "jira:issue_updated", "issue": {"key": "X-1"}}, token="bad") == 403
+        assert len(service.queue) == 3
+    # stop() verarbeitet den Rest: ein gebündelter Re-Fetch für A-1/A-2
+    assert sink.upserts == ["A-1", "A-2"]
+    assert sink.deletes == ["A-3"]
+    assert jqls == ['key in ("A-1", "A-2")']
+
+
+def test_sweep_queues_recently_updated_and_skips_applied(tmp_path):
+    jqls: list[str] = []
+    sink = MemorySink()
+    state = tmp_path / "sweep.json"
+    service = WebhookService(
+        make_client(jqls), sink, port=0, sweep_jql="project = S ORDER BY updated", sweep_interval=300, state_path=state
+    )
+    try:
+        assert service.sweep() == 1
+        assert service.flush() == 1
+        # S-1 ist mit diesem 'updated' bereits angewendet -> kein erneuter Fetch
+        assert service.sweep() == 0
+    finally:
+        service.stop()
+    assert jqls[0] == '(project = S) AND updated >= "-6m"'
+    # Rückblick seit dem letzten erfolgreichen Sweep statt fester sweep_interval-Fenster
+    assert jqls[2] in ('(project = S) AND updated >= "-1m"', '(project = S) AND updated >= "-2m"')
+    assert sink.upserts == ["S-1"]
+    assert json.loads(state.read_text(encoding="utf-8"))["last_sweep"] == service.last_sweep.isoformat()
+
+
+def test_sweep_window_covers_downtime_from_state(tmp_path):
+    from datetime import datetime, timedelta, timezone
+
+    state = tmp_path / "sweep.json"
+    last = datetime.now(timezone.utc) - timedelta(hours=3)
+    state.write_text(json.dumps({"last_sweep": last.isoformat()}), encoding="utf-8")
+    jqls: list[str] = []
+    service = WebhookService(make_client(jqls), MemorySink(), port=0, sweep_jql="project = S", state_path=state)
+    try:
+        service.sweep()
+    finally:
+        service.stop()
+    minutes = int(re.search(r'"-(\d+)m"', jqls[0]).group(1))
+    assert 180 < minutes <= 183
+
+
+def test_sweep_runs_at_startup():
+    jqls: list[str] = []
+    with WebhookService(make_client(jqls), MemorySink(), port=0, sweep_jql="project = S", sweep_interval=3600, flush_interval=60):
+        import time
+
+        deadline = time.monotonic() + 5
+        while not jqls and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert jqls and "updated >=" in jqls[0]
+
+
+def test_stop_without_start_does_not_hang():
+    service = WebhookService(make_client([]), MemorySink(), port=0)
+    service.queue.put("A-1", "upsert")
+    service.stop()
+
+
+def test_stop_logs_failing_final_flush(caplog):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, text="boom")
+
+    s = Settings(base_url="https://jira.local", pat="t", timeout_s=5.0)
+    client = JiraClient(s, client=s.build_client(transport=httpx.MockTransport(handler)))
+    service = WebhookService(client, MemorySink(), port=0)
+    service.queue.put("A-1", "upsert")
+    service.stop()  # darf nicht werfen
+    assert "Final webhook batch failed" in caplog.text
+
+
+def test_stop_is_prompt_when_idle():
+    import time
+
+    service = WebhookService(make_client([]), MemorySink(), port=0, flush_interval=60).start()
+    t0 = time.monotonic()
+    service.stop()
+    assert time.monotonic() - t0 < 2
+
+
+def _raw_post(service: WebhookService, headers: dict, body: bytes = b"") -> int:
+    import http.client
+
+    host, port = service.server_address
+    conn = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        conn.putrequest("POST", "/webhook")
+        for name, value in headers.items():
+            conn.putheader(name, value)
+        conn.endheaders(body)
+        return conn.getresponse().status
+    finally:
+        conn.close()
+
+
+def test_webhook_rejects_bad_length_and_oversized_body():
+    from jira_reporting.serve import MAX_BODY_BYTES
+
+    with WebhookService(make_client([]), MemorySink(), port=0, flush_interval=60) as service:
+        assert _raw_post(service, {"Content-Length": "abc"}) == 400
+        assert _raw_post(service, {"Content-Length": "-1"}) == 400
+        assert _raw_post(service, {"Content-Length": str(MAX_BODY_BYTES + 1)}) == 413
+        assert len(service.queue) == 0
+
+
+def test_cli_serve_stops_cleanly_on_sigterm(tmp_path):
+    import os
+    import signal
+    import subprocess
+    import sys
+    import time
+
+    env = dict(os.environ, JIRA_BASE_URL="https://jira.local", JIRA_PAT="t")
+    env.pop("JIRA_JQL", None)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "jira_reporting", "serve", "--port", "0", "--out", str(tmp_path / "c.ndjson")],
+        cwd=tmp_path,
+        env=env,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        deadline = time.monotonic() + 10
+        line = ""
+        while "listening" not in line and time.monotonic() < deadline:
+            line = proc.stderr.readline()
+        proc.send_signal(signal.SIGTERM)
+        _, err = proc.communicate(timeout=10)
+    finally:
+        proc.kill()
+    assert proc.returncode == 0
+    assert "Stopping webhook receiver" in err